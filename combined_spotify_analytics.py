@@ -3,11 +3,22 @@ Combined Spotify Analytics
 Loads historical CSV data and merges it with recent API listening data
 """
 
+import argparse
+import heapq
 import os
+import sys
 import json
+import pickle
+import time
+from collections import Counter
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
@@ -15,6 +26,15 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Copy-on-write lets combine_data alias the historical frame instead of deep-copying it
+pd.set_option('mode.copy_on_write', True)
+
+# Token cache written by authorize_spotify.py
+SPOTIFY_CACHE_PATH = '.spotify_cache'
+
+# Don't reuse a cached access token that expires within this many seconds
+TOKEN_EXPIRY_MARGIN_S = 60
+
 # === Data Filtering Constants ===
 # Only count plays longer than 30 seconds (Spotify's "counted as played" threshold)
 MIN_PLAY_TIME_MS = 30000
@@ -25,6 +45,69 @@ CONTENT_TYPE_FILTER = 'audio'
 # Timezone for local timestamp conversion
 TIMEZONE = 'US/Eastern'
 
+# Columns kept from the raw export; everything else is dropped at read time
+HISTORICAL_COLUMNS = [
+    'ts', 'ms_played', 'content_type', 'master_metadata_track_name',
+    'master_metadata_album_artist_name', 'master_metadata_album_album_name',
+    'spotify_track_uri', 'platform', 'conn_country', 'shuffle', 'skipped',
+]
+
+# Explicit column types so the CSV parser doesn't have to infer them
+# Repetitive strings are dictionary-encoded (pandas categories) so dedup/groupby/value_counts
+# work on integer codes
+_CATEGORY_TYPE = pa.dictionary(pa.int32(), pa.string())
+HISTORICAL_TYPES = {
+    'ts': pa.timestamp('ns', tz='UTC'),
+    'ms_played': pa.int32(),
+    'content_type': _CATEGORY_TYPE,
+    'master_metadata_track_name': _CATEGORY_TYPE,
+    'master_metadata_album_artist_name': _CATEGORY_TYPE,
+    'master_metadata_album_album_name': _CATEGORY_TYPE,
+    'platform': _CATEGORY_TYPE,
+    'conn_country': _CATEGORY_TYPE,
+    'shuffle': pa.bool_(),
+    'skipped': pa.bool_(),
+}
+
+# The historical CSV is parsed in blocks of this many bytes, so peak memory while
+# reading stays around one block of raw rows plus the rows that pass the filter
+CSV_BLOCK_SIZE = 16 * 1024 * 1024
+
+# Single fused row filter applied while scanning the historical data:
+# long-enough plays, music only, and identifiable tracks
+HISTORICAL_FILTER = (
+    (pc.field('ms_played') >= MIN_PLAY_TIME_MS)
+    & (pc.field('content_type') == CONTENT_TYPE_FILTER)
+    & pc.field('master_metadata_track_name').is_valid()
+)
+
+# Raw export column -> standardized column name
+HISTORICAL_RENAMES = {
+    'ts': 'played_at',
+    'master_metadata_track_name': 'track_name',
+    'master_metadata_album_artist_name': 'artist_name',
+    'master_metadata_album_album_name': 'album_name',
+    'ms_played': 'duration_ms',
+}
+
+# Standardized columns shared by historical and API data
+STANDARD_COLUMNS = [
+    'played_at', 'track_name', 'artist_name', 'album_name', 'duration_ms',
+    'spotify_track_uri', 'platform', 'conn_country', 'shuffle', 'skipped',
+]
+
+# A play is a duplicate if the same track was played at the same time
+DEDUP_COLUMNS = ['played_at', 'track_name', 'artist_name']
+
+# Standardized columns stored as pandas categories
+CATEGORICAL_COLUMNS = ['track_name', 'artist_name', 'album_name', 'platform', 'conn_country']
+
+
+def _most_played(counts, n=10):
+    """The n most played (key, count) pairs, breaking ties by key like the sorted groupby + nlargest did"""
+    return heapq.nsmallest(n, counts.items(), key=lambda item: (-item[1], item[0]))
+
+
 class CombinedSpotifyAnalytics:
     """
     Combines historical CSV data with recent API data
@@ -32,15 +115,35 @@ class CombinedSpotifyAnalytics:
 
     def __init__(self, csv_path="data/Spotify Streaming History.csv"):
         self.csv_path = Path(csv_path)
+        self.cache_dir = self.csv_path.parent / '.cache'
         self.historical_data = None
         self.api_data = None
+        self.new_api_data = None
         self.combined_data = None
 
         # Initialize Spotify API client
         self.sp = self._init_spotify_client()
 
+    def _load_cached_token(self):
+        """Return the cached access token if it's still valid, otherwise None"""
+        try:
+            with open(SPOTIFY_CACHE_PATH) as f:
+                token_info = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() < token_info.get('expires_at', 0) - TOKEN_EXPIRY_MARGIN_S:
+            return token_info.get('access_token')
+        return None
+
     def _init_spotify_client(self):
         """Initialize Spotify API client with authentication"""
+        # A still-valid cached token needs no OAuth manager (and no refresh round-trip)
+        access_token = self._load_cached_token()
+        if access_token:
+            print("✅ Successfully connected to Spotify API (cached token)")
+            return spotipy.Spotify(auth=access_token)
+
         try:
             sp_oauth = SpotifyOAuth(
                 client_id=os.getenv('SPOTIFY_CLIENT_ID'),
@@ -51,7 +154,7 @@ class CombinedSpotifyAnalytics:
                     'user-library-read',
                     'user-top-read',
                 ]),
-                cache_path='.spotify_cache'
+                cache_path=SPOTIFY_CACHE_PATH
             )
 
             sp = spotipy.Spotify(auth_manager=sp_oauth)
@@ -62,6 +165,54 @@ class CombinedSpotifyAnalytics:
             print("   Will only use historical CSV data")
             return None
 
+    def _cache_path(self, name, suffix):
+        """Path of a cache file derived from the CSV, keyed on the CSV's mtime and size"""
+        stat = self.csv_path.stat()
+        return self.cache_dir / f"{name}_{stat.st_mtime_ns}_{stat.st_size}{suffix}"
+
+    def _read_historical_csv(self):
+        """Parse, filter and standardize the historical CSV"""
+        # Stream only the kept columns, with fixed types, one block at a time
+        # (shuffle/skipped come back as nullable booleans since older exports leave them blank)
+        reader = pacsv.open_csv(
+            self.csv_path,
+            read_options=pacsv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=HISTORICAL_COLUMNS,
+                column_types=HISTORICAL_TYPES,
+                # Export timestamps are always ISO-8601 (2017-01-01T12:00:00Z);
+                # pinning the parser skips per-column format inference
+                timestamp_parsers=[pacsv.ISO8601],
+                strings_can_be_null=True,
+            ),
+        )
+
+        # Filter each block as it's read so discarded rows never accumulate
+        # Why 30 seconds? Spotify only counts plays > 30s in official statistics
+        # Why audio only? This dashboard focuses on music listening patterns
+        # Null track names couldn't be identified, so they're dropped too
+        blocks = [pa.Table.from_batches([batch]).filter(HISTORICAL_FILTER) for batch in reader]
+        table = pa.concat_tables(blocks) if blocks else reader.schema.empty_table()
+
+        # Create standardized columns in Arrow (ts is already parsed as a UTC datetime),
+        # so pandas only ever sees the final projection
+        table = table.rename_columns([HISTORICAL_RENAMES.get(c, c) for c in table.column_names])
+        table = table.select(STANDARD_COLUMNS)
+
+        # Sort once here (stable) so combine_data only has to append newer API rows
+        table = table.sort_by('played_at')
+
+        # self_destruct frees each Arrow column as soon as it's converted
+        df = table.to_pandas(
+            split_blocks=True,
+            self_destruct=True,
+            types_mapper={pa.bool_(): pd.BooleanDtype()}.get,
+        )
+        del table
+
+        # Remove duplicates once here; combine_data then only has to check the API rows
+        return df.drop_duplicates(subset=DEDUP_COLUMNS, keep='first', ignore_index=True)
+
     def load_historical_csv(self):
         """Load and process the historical CSV data"""
         print(f"\n📂 Loading historical data from {self.csv_path}...")
@@ -70,33 +221,22 @@ class CombinedSpotifyAnalytics:
             print(f"❌ Error: CSV file not found at {self.csv_path}")
             return False
 
-        # Load CSV
-        df = pd.read_csv(self.csv_path)
-
-        # Convert timestamp to datetime
-        df['timestamp'] = pd.to_datetime(df['ts'])
-
-        # Filter out very short plays
-        # Why 30 seconds? Spotify only counts plays > 30s in official statistics
-        df = df[df['ms_played'] >= MIN_PLAY_TIME_MS]
-
-        # Filter for audio content only (music, not podcasts/videos)
-        # Why audio only? This dashboard focuses on music listening patterns
-        df = df[df['content_type'] == CONTENT_TYPE_FILTER]
-
-        # Create standardized columns
-        df['played_at'] = df['timestamp']
-        df['track_name'] = df['master_metadata_track_name']
-        df['artist_name'] = df['master_metadata_album_artist_name']
-        df['album_name'] = df['master_metadata_album_album_name']
-        df['duration_ms'] = df['ms_played']
-
-        # Remove rows with null track names (couldn't be identified)
-        df = df[df['track_name'].notna()]
-
-        self.historical_data = df[['played_at', 'track_name', 'artist_name',
-                                     'album_name', 'duration_ms', 'spotify_track_uri',
-                                     'platform', 'conn_country', 'shuffle', 'skipped']]
+        # The processed history only changes when the CSV does, so reuse it when we can
+        cache_path = self._cache_path('history', '.parquet')
+        if cache_path.exists():
+            self.historical_data = pd.read_parquet(cache_path)
+        else:
+            self.historical_data = self._read_historical_csv()
+
+            # Everything this class cached for the previous CSV is stale now
+            # (counts_* and play_counts_* are the play counts cache's earlier names)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for pattern in ('history_*.parquet', 'ranked_counts_*.pkl', 'play_counts_*.pkl', 'counts_*.pkl'):
+                for stale in self.cache_dir.glob(pattern):
+                    if stale.is_file():
+                        stale.unlink()
+            self.historical_data.to_parquet(cache_path, engine='pyarrow', compression='zstd', index=False)
+            print(f"   Cached processed history to {cache_path}")
 
         print(f"✅ Loaded {len(self.historical_data):,} historical streams")
         print(f"   Date range: {self.historical_data['played_at'].min()} to {self.historical_data['played_at'].max()}")
@@ -117,7 +257,8 @@ class CombinedSpotifyAnalytics:
         print(f"\n🔄 Fetching recent listening data from Spotify API...")
 
         try:
-            all_tracks = []
+            # Build the frame column-wise rather than from a list of row dicts
+            columns = {col: [] for col in STANDARD_COLUMNS}
 
             # Fetch recently played tracks
             # Note: Spotify API only provides last 50 tracks
@@ -126,21 +267,20 @@ class CombinedSpotifyAnalytics:
             for item in results['items']:
                 track = item['track']
 
-                all_tracks.append({
-                    'played_at': item['played_at'],
-                    'track_name': track['name'],
-                    'artist_name': track['artists'][0]['name'] if track['artists'] else None,
-                    'album_name': track['album']['name'] if track['album'] else None,
-                    'duration_ms': track['duration_ms'],
-                    'spotify_track_uri': track['uri'],
-                    'platform': 'API',
-                    'conn_country': None,
-                    'shuffle': None,
-                    'skipped': None,
-                })
-
-            self.api_data = pd.DataFrame(all_tracks)
-            self.api_data['played_at'] = pd.to_datetime(self.api_data['played_at'])
+                columns['played_at'].append(item['played_at'])
+                columns['track_name'].append(track['name'])
+                columns['artist_name'].append(track['artists'][0]['name'] if track['artists'] else None)
+                columns['album_name'].append(track['album']['name'] if track['album'] else None)
+                columns['duration_ms'].append(track['duration_ms'])
+                columns['spotify_track_uri'].append(track['uri'])
+                columns['platform'].append('API')
+                columns['conn_country'].append(None)
+                columns['shuffle'].append(None)
+                columns['skipped'].append(None)
+
+            # shuffle/skipped aren't reported by the API; match the historical nullable booleans
+            self.api_data = pd.DataFrame(columns).astype({'shuffle': 'boolean', 'skipped': 'boolean'})
+            self.api_data['played_at'] = pd.to_datetime(self.api_data['played_at'], utc=True, format='ISO8601')
 
             print(f"✅ Fetched {len(self.api_data)} recent tracks from API")
             if len(self.api_data) > 0:
@@ -160,29 +300,42 @@ class CombinedSpotifyAnalytics:
             print("❌ No historical data loaded")
             return False
 
-        # Start with historical data
-        combined = self.historical_data.copy()
+        # Start with historical data (no copy needed under copy-on-write)
+        combined = self.historical_data
+        self.new_api_data = None
 
         # Add API data if available
         if self.api_data is not None and len(self.api_data) > 0:
-            # Find the cutoff date (last date in historical data)
-            last_historical_date = combined['played_at'].max()
+            # Find the cutoff date (historical data is sorted, so it's the last row)
+            last_historical_date = combined['played_at'].iloc[-1]
 
             # Only add API data that's newer than historical data
+            # (so it can't duplicate a historical play, only another API row)
             new_api_data = self.api_data[self.api_data['played_at'] > last_historical_date]
+            new_api_data = new_api_data.drop_duplicates(subset=DEDUP_COLUMNS, keep='first')
 
             if len(new_api_data) > 0:
-                combined = pd.concat([combined, new_api_data], ignore_index=True)
+                # API rows come newest-first; sorting them keeps the appended frame in order
+                new_api_data = new_api_data.sort_values('played_at', kind='mergesort')
+
+                # Extend the categories so concat keeps the categorical dtypes
+                extended = {}
+                for col in CATEGORICAL_COLUMNS:
+                    categories = combined[col].cat.categories
+                    new_values = pd.Index(new_api_data[col].dropna().unique()).difference(categories)
+                    if len(new_values) > 0:
+                        extended[col] = combined[col].cat.add_categories(new_values)
+                        categories = extended[col].cat.categories
+                    new_api_data[col] = pd.Categorical(new_api_data[col], categories=categories)
+
+                # assign() only replaces the extended columns; the rest stay shared with historical_data
+                combined = combined.assign(**extended)
+                combined = pd.concat([combined, new_api_data], ignore_index=True, copy=False)
+                self.new_api_data = new_api_data
                 print(f"✅ Added {len(new_api_data)} new tracks from API")
             else:
                 print(f"ℹ️  No new tracks from API (historical data is up to date)")
 
-        # Sort by timestamp
-        combined = combined.sort_values('played_at').reset_index(drop=True)
-
-        # Remove duplicates (same track played at same time)
-        combined = combined.drop_duplicates(subset=['played_at', 'track_name', 'artist_name'], keep='first')
-
         self.combined_data = combined
 
         print(f"\n📊 Combined Data Summary:")
@@ -193,56 +346,148 @@ class CombinedSpotifyAnalytics:
 
         return True
 
-    def get_statistics(self):
-        """Get comprehensive statistics from combined data"""
+    def get_statistics(self, detailed=True):
+        """
+        Get comprehensive statistics from combined data
+
+        Args:
+            detailed: Also compute unique counts and top 10 artists/tracks
+                (the expensive part, which scans every play)
+        """
         if self.combined_data is None:
             print("❌ No combined data available")
             return None
 
         df = self.combined_data
 
-        stats = {
+        stats = self._summary_statistics(df)
+        if detailed:
+            stats.update(self._ranking_statistics())
+
+        return stats
+
+    def _summary_statistics(self, df):
+        """Cheap totals and date range"""
+        # combined_data is sorted by played_at, so the ends are the first and last rows
+        # and distinct years are just the number of year changes + 1
+        years = df['played_at'].values.astype('datetime64[Y]')
+
+        return {
             'total_streams': len(df),
-            'unique_tracks': df['track_name'].nunique(),
-            'unique_artists': df['artist_name'].nunique(),
             'total_hours': round(df['duration_ms'].sum() / (1000 * 60 * 60), 1),
             'date_range': {
-                'first': df['played_at'].min().strftime('%Y-%m-%d'),
-                'last': df['played_at'].max().strftime('%Y-%m-%d'),
+                'first': df['played_at'].iloc[0].strftime('%Y-%m-%d'),
+                'last': df['played_at'].iloc[-1].strftime('%Y-%m-%d'),
             },
-            'years_of_data': df['played_at'].dt.year.nunique(),
+            'years_of_data': int(np.count_nonzero(np.diff(years))) + 1,
         }
 
-        # Top artists
-        top_artists = df['artist_name'].value_counts().head(10)
-        stats['top_10_artists'] = top_artists.to_dict()
+    def _historical_counts(self):
+        """
+        Play counts per artist and per (track, artist), and the set of played
+        track names, for the historical data
 
-        # Top tracks
-        top_tracks = df.groupby(['track_name', 'artist_name']).size().nlargest(10)
-        stats['top_10_tracks'] = [
-            {'track': track, 'artist': artist, 'plays': count}
-            for (track, artist), count in top_tracks.items()
-        ]
+        Cached next to the processed history, so they're only counted once per CSV
+        """
+        cache_path = self._cache_path('ranked_counts', '.pkl')
+        if cache_path.exists():
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+
+        df = self.historical_data
+
+        # Count on the categorical codes (-1 marks a missing value) instead of hashing strings
+        track_names = df['track_name'].cat.categories
+        artist_names = df['artist_name'].cat.categories
+        track_codes = df['track_name'].cat.codes.to_numpy()
+        artist_codes = df['artist_name'].cat.codes.to_numpy()
+
+        # Artists are kept in order of first play, the order value_counts saw them in,
+        # so the top 10 can break ties the same way
+        artist_bins = np.bincount(artist_codes[artist_codes >= 0], minlength=len(artist_names))
+        first_seen = pd.unique(artist_codes)
+        artist_counts = Counter({
+            artist_names[i]: int(artist_bins[i]) for i in first_seen[first_seen >= 0]
+        })
+
+        # Tracks are counted on their own too, so ones with no artist still count as unique
+        track_bins = np.bincount(track_codes[track_codes >= 0], minlength=len(track_names))
+        played_tracks = set(track_names[np.flatnonzero(track_bins)])
+
+        # Each (track, artist) pair as one integer key
+        # (np.unique rather than bincount: a dense tracks x artists table can be huge)
+        known = (track_codes >= 0) & (artist_codes >= 0)
+        pairs = track_codes[known].astype(np.int64) * len(artist_names) + artist_codes[known]
+        pair_keys, pair_counts = np.unique(pairs, return_counts=True)
+        track_counts = Counter({
+            (track_names[key // len(artist_names)], artist_names[key % len(artist_names)]): int(count)
+            for key, count in zip(pair_keys, pair_counts)
+        })
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'wb') as f:
+            pickle.dump((artist_counts, track_counts, played_tracks), f)
+
+        return artist_counts, track_counts, played_tracks
+
+    def _ranking_statistics(self):
+        """Unique counts and top 10 artists/tracks"""
+        artist_counts, track_counts, played_tracks = self._historical_counts()
+
+        # Only the API rows appended by combine_data need counting on top of the history
+        if self.new_api_data is not None:
+            new_plays = self.new_api_data.dropna(subset=['track_name', 'artist_name'])
+            artist_counts.update(self.new_api_data['artist_name'].dropna())
+            track_counts.update(zip(new_plays['track_name'], new_plays['artist_name']))
+            played_tracks.update(self.new_api_data['track_name'].dropna())
+
+        return {
+            'unique_tracks': len(played_tracks),
+            'unique_artists': len(artist_counts),
+            # Same sort as the value_counts() this replaces, so tied artists come out in the same order
+            'top_10_artists': pd.Series(artist_counts, dtype='int64').sort_values(ascending=False).head(10).to_dict(),
+            'top_10_tracks': [
+                {'track': track, 'artist': artist, 'plays': count}
+                for (track, artist), count in _most_played(track_counts)
+            ],
+        }
 
-        return stats
+    def save_combined_data(self, output_path=None, format='parquet'):
+        """
+        Save the combined data to a Parquet (default) or CSV file
 
-    def save_combined_data(self, output_path="data/combined_listening_history.csv"):
-        """Save the combined data to a CSV file"""
+        Args:
+            output_path: Where to write (defaults to data/combined_listening_history.<format>)
+            format: 'parquet', or 'csv' for the old plain-text output
+        """
         if self.combined_data is None:
             print("❌ No combined data to save")
             return False
 
-        output_path = Path(output_path)
+        if format not in ('parquet', 'csv'):
+            print(f"❌ Unknown output format: {format}")
+            return False
+
+        output_path = Path(output_path or f"data/combined_listening_history.{format}")
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        self.combined_data.to_csv(output_path, index=False)
+        # Parquet keeps the dtypes (no re-parsing played_at on read) and is much smaller
+        if format == 'parquet':
+            self.combined_data.to_parquet(output_path, engine='pyarrow', compression='zstd', index=False)
+        else:
+            self.combined_data.to_csv(output_path, index=False)
         print(f"\n💾 Saved combined data to {output_path}")
 
         return True
 
-    def print_statistics(self):
-        """Print comprehensive statistics"""
-        stats = self.get_statistics()
+    def print_statistics(self, detailed=True):
+        """
+        Print comprehensive statistics
+
+        Args:
+            detailed: Include unique counts and top 10 artists/tracks
+        """
+        stats = self.get_statistics(detailed=detailed)
 
         if not stats:
             return
@@ -251,46 +496,60 @@ class CombinedSpotifyAnalytics:
         print("🎵 YOUR COMPLETE SPOTIFY STATISTICS 🎵")
         print("="*60)
         print(f"Total Streams: {stats['total_streams']:,}")
-        print(f"Unique Tracks: {stats['unique_tracks']:,}")
-        print(f"Unique Artists: {stats['unique_artists']:,}")
+        if detailed:
+            print(f"Unique Tracks: {stats['unique_tracks']:,}")
+            print(f"Unique Artists: {stats['unique_artists']:,}")
         print(f"Total Listening Time: {stats['total_hours']:,} hours")
         print(f"Date Range: {stats['date_range']['first']} to {stats['date_range']['last']}")
         print(f"Years of Data: {stats['years_of_data']}")
 
-        print(f"\n🏆 Top 10 Artists:")
-        for i, (artist, plays) in enumerate(list(stats['top_10_artists'].items()), 1):
-            print(f"   {i:2}. {artist:<40} ({plays:,} plays)")
+        if detailed:
+            print(f"\n🏆 Top 10 Artists:")
+            for i, (artist, plays) in enumerate(list(stats['top_10_artists'].items()), 1):
+                print(f"   {i:2}. {artist:<40} ({plays:,} plays)")
 
-        print(f"\n🎵 Top 10 Tracks:")
-        for i, track_info in enumerate(stats['top_10_tracks'], 1):
-            print(f"   {i:2}. {track_info['track']:<35} - {track_info['artist']:<30} ({track_info['plays']} plays)")
+            print(f"\n🎵 Top 10 Tracks:")
+            for i, track_info in enumerate(stats['top_10_tracks'], 1):
+                print(f"   {i:2}. {track_info['track']:<35} - {track_info['artist']:<30} ({track_info['plays']} plays)")
 
         print("="*60)
 
 
 def main():
     """Main execution"""
+    parser = argparse.ArgumentParser(description="Combine historical CSV and recent API listening data")
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help="print top artists/tracks even when output isn't a terminal",
+    )
+    args = parser.parse_args()
+
     print("🎵 Combined Spotify Analytics")
     print("   Historical CSV + Recent API Data\n")
 
     # Initialize analytics
     analytics = CombinedSpotifyAnalytics()
 
-    # Load historical CSV
-    if not analytics.load_historical_csv():
+    # Load historical CSV and fetch recent API data at the same time
+    # (parsing and the network round-trip are independent and both release the GIL)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        historical_future = executor.submit(analytics.load_historical_csv)
+        api_future = executor.submit(analytics.fetch_recent_api_data, limit=50)
+        historical_loaded = historical_future.result()
+        api_future.result()
+
+    if not historical_loaded:
         print("\n❌ Failed to load historical data")
         return
 
-    # Fetch recent API data
-    analytics.fetch_recent_api_data(limit=50)
-
     # Combine the data
     if not analytics.combine_data():
         print("\n❌ Failed to combine data")
         return
 
-    # Print statistics
-    analytics.print_statistics()
+    # Print statistics (rankings only when someone is watching, e.g. not under Airflow)
+    analytics.print_statistics(detailed=args.verbose or sys.stdout.isatty())
 
     # Save combined data
     analytics.save_combined_data()
@@ -299,7 +558,7 @@ def main():
     print("\n💡 Next steps:")
     print("   - Use the combined data for visualizations")
     print("   - Run this script periodically to update with latest API data")
-    print("   - The combined data is saved to data/combined_listening_history.csv")
+    print("   - The combined data is saved to data/combined_listening_history.parquet")
 
 
 if __name__ == "__main__":
@@ -1,10 +1,18 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 from datetime import datetime
 import spotipy
-from spotipy.oauth2 import SpotifyOAuth
+from spotipy.oauth2 import SpotifyClientCredentials
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from concurrent.futures import ThreadPoolExecutor
+import dbm
 import os
+import shelve
+import threading
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -66,6 +74,23 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+DATA_PATH = 'data/combined_listening_history.parquet'
+# Written by `combined_spotify_analytics.py` before it switched to Parquet; used when DATA_PATH doesn't exist
+CSV_DATA_PATH = 'data/combined_listening_history.csv'
+# Preprocessed load_data() output, reused across app restarts while newer than the source file
+CACHE_PATH = 'data/_cache.feather'
+# Image URLs already looked up on Spotify, kept across app restarts
+IMAGE_CACHE_PATH = 'data/.image_cache'
+# Seconds before a stored image URL is looked up again; lookups that found
+# nothing are retried sooner, since Spotify may have the image by then
+IMAGE_CACHE_TTL = 30 * 24 * 60 * 60
+IMAGE_MISS_TTL = 24 * 60 * 60
+# What opening or using the shelf can raise: dbm.error (itself a tuple) for an unrecognised file,
+# ValueError/SyntaxError for a corrupt dbm.dumb index
+IMAGE_CACHE_ERRORS = (OSError, ValueError, SyntaxError, *dbm.error)
+
+DAY_NAMES = np.array(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'])
+
 @st.cache_data
 def load_data():
     """Load and preprocess Spotify listening history data.
@@ -74,103 +99,287 @@ def load_data():
     converts timestamps to local timezone, and creates additional
     time-based columns for analysis.
     """
-    df = pd.read_csv('data/combined_listening_history.csv', low_memory=False)
+    source_path = DATA_PATH if os.path.exists(DATA_PATH) else CSV_DATA_PATH
+    if os.path.exists(CACHE_PATH) and os.path.getmtime(CACHE_PATH) > os.path.getmtime(source_path):
+        return pd.read_feather(CACHE_PATH)
+
+    columns = ['played_at', 'duration_ms', 'track_name', 'artist_name']
+    if source_path == DATA_PATH:
+        df = pd.read_parquet(DATA_PATH, columns=columns, engine='pyarrow')
+    else:
+        # Arrow's multithreaded CSV reader parses the ISO-8601 timestamps during the scan
+        df = pd.read_csv(
+            CSV_DATA_PATH,
+            engine='pyarrow',
+            usecols=columns,
+            dtype={'track_name': 'category', 'artist_name': 'category'}
+        )
+        if not isinstance(df['played_at'].dtype, pd.DatetimeTZDtype):
+            df['played_at'] = pd.to_datetime(df['played_at'], utc=True)
 
-    # Convert UTC timestamps to local timezone (US/Eastern)
-    df['played_at'] = pd.to_datetime(df['played_at'], format='mixed', utc=True)
+    # played_at is a UTC datetime, so it only needs converting to local time (US/Eastern)
     df['played_at_local'] = df['played_at'].dt.tz_convert('US/Eastern')
 
+    # Naive local wall-clock time: tz-aware .dt accessors redo the UTC -> local
+    # conversion on every call, so derive all the time components from this instead
+    local_time = df['played_at_local'].dt.tz_localize(None)
+    year = local_time.dt.year
+
     # Filter to data from 2017 onwards for consistency
-    df = df[df['played_at_local'].dt.year >= 2017]
+    keep = year >= 2017
+    df = df[keep]
+    local_time = local_time[keep]
+
+    # Names stay categorical (as stored by the pipeline) so counts and groupbys
+    # work on integer codes; drop the categories only seen before 2017
+    for col in ('track_name', 'artist_name'):
+        df[col] = df[col].astype('category').cat.remove_unused_categories()
 
     # Extract time components for temporal analysis
-    df['year'] = df['played_at_local'].dt.year
-    df['month'] = df['played_at_local'].dt.month
-    df['hour'] = df['played_at_local'].dt.hour
-    df['day_of_week'] = df['played_at_local'].dt.dayofweek
-    df['day_name'] = df['played_at_local'].dt.day_name()
+    df['year'] = year[keep]
+    df['month'] = local_time.dt.month
+    df['hour'] = local_time.dt.hour
+    df['day_of_week'] = local_time.dt.dayofweek
+    df['day_name'] = pd.Categorical.from_codes(df['day_of_week'].to_numpy(), DAY_NAMES)
     df['minutes'] = df['duration_ms'] / 60000
-    df['date'] = df['played_at_local'].dt.date
+
+    # The pipeline writes plays in time order; the year filter relies on it
+    if not df['played_at'].is_monotonic_increasing:
+        df = df.sort_values('played_at', kind='stable')
+    df = df.reset_index(drop=True)
+    try:
+        df.to_feather(CACHE_PATH, compression='zstd')
+    except OSError:
+        # Read-only deployments just skip the disk cache
+        pass
 
     return df
 
+@st.cache_data(show_spinner=False)
+def first_artist_year(df):
+    """Year each artist was first played, over the full dataset."""
+    return df.groupby('artist_name', observed=True)['year'].min()
+
+@st.cache_data(show_spinner=False)
+def first_track_year(df):
+    """Year each (track, artist) pair was first played, over the full dataset."""
+    return df.groupby(['track_name', 'artist_name'], observed=True)['year'].min()
+
+@st.cache_data(show_spinner=False)
+def yearly_summary(df):
+    """Per-year plays, minutes, unique artists and unique tracks.
+
+    Covers every year from the first to the last so gap years read as zeros.
+    """
+    g = df.groupby('year')
+    tracks = df.groupby(['year', 'track_name', 'artist_name'], observed=True).size()
+    summary = pd.DataFrame({
+        'plays': g.size(),
+        'minutes': g['minutes'].sum(),
+        'artists': g['artist_name'].nunique(),
+        'tracks': tracks.groupby(level='year').size(),
+    })
+    return summary.reindex(range(summary.index.min(), summary.index.max() + 1), fill_value=0)
+
 df = load_data()
 
 @st.cache_resource
 def init_spotify_client():
     """Initialize Spotify API client for fetching album/artist images.
 
-    Uses OAuth authentication with credentials from environment variables.
+    Images are public catalog data, so this uses an app-only client credentials
+    token (no user OAuth) with credentials from environment variables.
     Returns None if initialization fails to allow graceful degradation.
     """
     try:
-        sp_oauth = SpotifyOAuth(
+        auth_manager = SpotifyClientCredentials(
             client_id=os.getenv('SPOTIFY_CLIENT_ID'),
-            client_secret=os.getenv('SPOTIFY_CLIENT_SECRET'),
-            redirect_uri=os.getenv('SPOTIFY_REDIRECT_URI'),
-            scope='user-read-recently-played user-library-read user-top-read',
-            cache_path='.spotify_cache'
+            client_secret=os.getenv('SPOTIFY_CLIENT_SECRET')
         )
-        return spotipy.Spotify(auth_manager=sp_oauth)
+        # Short timeout and few retries so a flaky lookup can't stall a rerun
+        return spotipy.Spotify(auth_manager=auth_manager, requests_timeout=5, retries=2)
     except:
         return None
 
 sp = init_spotify_client()
 
-@st.cache_data
+@st.cache_resource(show_spinner=False)
+def image_cache_lock():
+    """Process-wide lock for the image shelf.
+
+    The script module is re-executed on every rerun, so a module-level lock
+    would only cover one run; sessions and overlapping reruns share this one.
+    """
+    return threading.Lock()
+
+def cached_image_lookup(key, fetch):
+    """Return the image URL stored on disk for key, calling fetch() on a miss.
+
+    Entries are stored as (lookup time, url) and looked up again once older than
+    IMAGE_CACHE_TTL, or IMAGE_MISS_TTL when no image was found. Lookups that
+    raise aren't stored, so they're retried on the next run.
+    """
+    lock = image_cache_lock()
+    try:
+        with lock, shelve.open(IMAGE_CACHE_PATH) as cache:
+            entry = cache.get(key)
+    except IMAGE_CACHE_ERRORS:
+        # No usable disk cache (e.g. read-only deployment or a corrupt file); always ask Spotify
+        return fetch()
+
+    # Entries from before expiry was tracked are plain URLs; treat them as stale
+    if isinstance(entry, tuple):
+        fetched_at, image_url = entry
+        ttl = IMAGE_CACHE_TTL if image_url else IMAGE_MISS_TTL
+        if time.time() - fetched_at < ttl:
+            return image_url
+
+    image_url = fetch()
+    try:
+        with lock, shelve.open(IMAGE_CACHE_PATH) as cache:
+            cache[key] = (time.time(), image_url)
+    except IMAGE_CACHE_ERRORS:
+        pass
+    return image_url
+
+@st.cache_data(show_spinner=False, max_entries=2000, ttl=IMAGE_MISS_TTL)
 def get_track_image(track_name, artist_name):
     """Fetch album cover image URL for a track via Spotify Web API."""
     if not sp:
         return None
-    try:
+
+    def fetch():
         results = sp.search(q=f"track:{track_name} artist:{artist_name}", type='track', limit=1)
         if results['tracks']['items']:
             track = results['tracks']['items'][0]
             if track['album']['images']:
                 # Return largest image (first in array)
                 return track['album']['images'][0]['url']
-    except:
-        pass
-    return None
+        return None
 
-@st.cache_data
+    try:
+        return cached_image_lookup(f"track:{track_name}\tartist:{artist_name}", fetch)
+    except Exception:
+        return None
+
+@st.cache_data(show_spinner=False, max_entries=2000, ttl=IMAGE_MISS_TTL)
 def get_artist_image(artist_name):
     """Fetch artist profile image URL via Spotify Web API."""
     if not sp:
         return None
-    try:
+
+    def fetch():
         results = sp.search(q=f"artist:{artist_name}", type='artist', limit=1)
         if results['artists']['items']:
             artist = results['artists']['items'][0]
             if artist['images']:
                 # Return largest image (first in array)
                 return artist['images'][0]['url']
-    except:
-        pass
-    return None
+        return None
+
+    try:
+        return cached_image_lookup(f"artist:{artist_name}", fetch)
+    except Exception:
+        return None
 
-def display_image_with_placeholder(image_url, fallback_emoji, width=50):
-    """Display image if available, otherwise show emoji placeholder.
+def select_years(df, start_year, end_year):
+    """Rows played from start_year through end_year.
 
-    Provides graceful degradation when Spotify API is unavailable
-    or images can't be fetched.
+    Rows are in time order, so each year is a contiguous block and the range is a plain row slice.
     """
+    lo, hi = df['year'].searchsorted([start_year, end_year + 1])
+    return df.iloc[lo:hi]
+
+def song_artists_for(df, tracks):
+    """Artist of each of tracks (its first play's artist), indexed by track name.
+
+    Projects and masks to just those tracks before a single groupby, instead of
+    scanning the frame once per song.
+    """
+    song_artists = df[['track_name', 'artist_name']]
+    return (
+        song_artists[song_artists['track_name'].isin(tracks)]
+        .groupby('track_name', observed=True, sort=False)['artist_name']
+        .first()
+    )
+
+def weekday_counts(start, end):
+    """Number of Mondays, Tuesdays, ... Sundays in the dates start through end."""
+    full_weeks, extra_days = divmod((end - start).days + 1, 7)
+    counts = np.full(7, full_weeks)
+    counts[(start.weekday() + np.arange(extra_days)) % 7] += 1
+    return counts
+
+def fetch_images(lookup, *args):
+    """Run an image lookup for each set of args concurrently, returning the URLs in order.
+
+    The lookups are network-bound, so a page of them takes about as long as the slowest one.
+    """
+    ctx = get_script_run_ctx()
+    # Worker threads need the script context to use the st.cache_data wrappers
+    with ThreadPoolExecutor(max_workers=10, initializer=lambda: add_script_run_ctx(ctx=ctx)) as executor:
+        return list(executor.map(lookup, *args))
+
+def two_column_html(left_rows, right_rows, gap, extra_style=''):
+    """HTML for two side-by-side columns of rows, styled like a pair of st.columns.
+
+    The first column gets the same divider, padding and margin as the page's
+    [data-testid="column"]:first-child rule; gap matches the st.columns gap
+    ('1rem' for small, '2rem' for medium).
+    """
+    return (
+        f'<div style="display: flex; gap: {gap}; {extra_style}">'
+        '<div style="flex: 1; min-width: 0; border-right: 1px solid rgba(128, 128, 128, 0.3); '
+        'padding-right: 2rem; margin-right: 1rem;">'
+        + ''.join(left_rows)
+        + '</div><div style="flex: 1; min-width: 0;">'
+        + ''.join(right_rows)
+        + '</div></div>'
+    )
+
+def top_ten_html(entries, placeholder_emoji):
+    """HTML for a ranked list laid out as two columns of five, for a single st.markdown call.
+
+    entries holds (image_url, title, subtitle) tuples in rank order; a missing
+    image shows placeholder_emoji instead.
+    """
+    rows = []
+    for i, (image_url, title, subtitle) in enumerate(entries):
+        if image_url:
+            img_html = f'<img src="{image_url}" width="50" style="border-radius: 4px; vertical-align: middle; margin-right: 10px;">'
+        else:
+            img_html = f'<span style="display: inline-block; width: 50px; height: 50px; background: #282828; border-radius: 4px; text-align: center; line-height: 50px; margin-right: 10px; vertical-align: middle;">{placeholder_emoji}</span>'
+        rows.append(
+            f'<div style="display: flex; align-items: center; margin-bottom: 15px;">{img_html}'
+            f'<div><b>{i+1}.</b> {title}<br><span style="color: #B3B3B3; font-size: 0.85rem;">{subtitle}</span></div></div>'
+        )
+
+    # Top padding aligns the list with the chart title area beside it
+    return two_column_html(rows[:5], rows[5:], gap='1rem', extra_style='margin-top: 55px;')
+
+def seasonal_row_html(rank, item, total_plays, season_boxes, image_url, placeholder_emoji, subtitle=None):
+    """HTML for one ranked row of the seasonal top 30: image, title, optional subtitle and season boxes."""
     if image_url:
-        st.image(image_url, width=width)
+        img_html = f'<img src="{image_url}" width="55" height="55" style="border-radius: 4px; margin-right: 10px; object-fit: cover; flex-shrink: 0;">'
     else:
-        # Styled placeholder box with emoji
-        st.markdown(f"""
-            <div style="width: {width}px;
-                        height: {width}px;
-                        background-color: rgba(128, 128, 128, 0.2);
-                        border-radius: 4px;
-                        display: flex;
-                        align-items: center;
-                        justify-content: center;
-                        font-size: 24px;">
-                {fallback_emoji}
-            </div>
-        """, unsafe_allow_html=True)
+        img_html = f'<span style="display: inline-block; width: 55px; height: 55px; background: #282828; border-radius: 4px; text-align: center; line-height: 55px; margin-right: 10px; flex-shrink: 0; font-size: 1.3rem;">{placeholder_emoji}</span>'
+
+    # Rows with a subtitle tighten the spacing around it to keep the same height
+    if subtitle is None:
+        title_gap, boxes_gap, subtitle_html = 3, 4, ''
+    else:
+        title_gap, boxes_gap = 2, 3
+        subtitle_html = f"<div style='color: #B3B3B3; font-size: 0.8rem; margin-bottom: 3px;'>{subtitle}</div>"
+
+    return (
+        f'<div style="display: flex; align-items: center; margin-bottom: 12px; padding: 8px; border-radius: 6px; transition: background-color 0.2s;">{img_html}'
+        f'<div style="flex: 1; min-width: 0;">'
+        f'<div style="margin-bottom: {title_gap}px; overflow: hidden; text-overflow: ellipsis;">'
+        f"<span style='font-size: 0.85rem; font-weight: 600; color: #1DB954;'>#{rank}</span>"
+        f'<span style="font-weight: 600; margin-left: 4px;">{item}</span>'
+        f"<span style='color: #B3B3B3; font-size: 0.8rem; margin-left: 6px;'>({total_plays:,})</span></div>"
+        f'{subtitle_html}<div style="margin-top: {boxes_gap}px;">{season_boxes}</div></div></div>'
+    )
 
 # === Header and Year Range Filter ===
 col_title, col_spacer, col_year = st.columns([3, 1, 2])
@@ -201,31 +410,34 @@ with col_year:
         end_year = st.selectbox("End Year", valid_end_years, index=default_end_index, key="end_year")
 
 # Filter dataset based on selected year range
-filtered_df = df[(df['year'] >= start_year) & (df['year'] <= end_year)]
+filtered_df = select_years(df, start_year, end_year)
 
 st.markdown("---")
 
 # === Summary Metrics ===
 col1, col2, col3, col4 = st.columns(4)
 
-# Calculate core metrics from filtered data
-total_plays = len(filtered_df)
-hours = filtered_df['minutes'].sum() / 60
+# Calculate core metrics from the per-year summary; unique counts over a
+# multi-year range can't be summed, so those come from filtered_df
+yearly = yearly_summary(df)
+selected_years = yearly.loc[start_year:end_year]
+total_plays = selected_years['plays'].sum()
+hours = selected_years['minutes'].sum() / 60
 days = hours / 24
-artists = filtered_df['artist_name'].nunique()
-filtered_df['track_key'] = filtered_df['track_name'] + ' - ' + filtered_df['artist_name']
-tracks = filtered_df['track_key'].nunique()
+if start_year == end_year:
+    artists = selected_years['artists'].iloc[0]
+    tracks = selected_years['tracks'].iloc[0]
+else:
+    artists = filtered_df['artist_name'].nunique()
+    tracks = filtered_df.groupby(['track_name', 'artist_name'], observed=True, sort=False).ngroups
 
 # Show year-over-year comparisons when viewing a single year
-if start_year == end_year and start_year > min(df['year'].unique()):
+if start_year == end_year and start_year > min_year:
     prev_year = start_year - 1
-    prev_year_df = df[df['year'] == prev_year]
-
-    prev_plays = len(prev_year_df)
-    prev_hours = prev_year_df['minutes'].sum() / 60
-    prev_artists = prev_year_df['artist_name'].nunique()
-    prev_year_df['track_key'] = prev_year_df['track_name'] + ' - ' + prev_year_df['artist_name']
-    prev_tracks = prev_year_df['track_key'].nunique()
+    prev_plays = yearly.at[prev_year, 'plays']
+    prev_hours = yearly.at[prev_year, 'minutes'] / 60
+    prev_artists = yearly.at[prev_year, 'artists']
+    prev_tracks = yearly.at[prev_year, 'tracks']
 
     plays_delta = total_plays - prev_plays
     plays_pct = (plays_delta / prev_plays * 100) if prev_plays > 0 else 0
@@ -248,7 +460,7 @@ if start_year == end_year and start_year > min(df['year'].unique()):
                  f"{hours_delta:+,.0f} hrs ({hours_pct:+.1f}%) vs {prev_year}")
 
     with col3:
-        first_listen_year = df.groupby('artist_name')['year'].min()
+        first_listen_year = first_artist_year(df)
         new_artists_this_year = (first_listen_year == start_year).sum()
 
         st.metric("Unique Artists", f"{artists:,}",
@@ -256,8 +468,7 @@ if start_year == end_year and start_year > min(df['year'].unique()):
         st.caption(f"🎤 {new_artists_this_year:,} new artists discovered")
 
     with col4:
-        df['track_key'] = df['track_name'] + ' - ' + df['artist_name']
-        first_listen_year = df.groupby('track_key')['year'].min()
+        first_listen_year = first_track_year(df)
         new_tracks_this_year = (first_listen_year == start_year).sum()
 
         st.metric("Unique Tracks", f"{tracks:,}",
@@ -297,7 +508,7 @@ else:
     with col3:
         st.metric("Unique Artists", f"{artists:,}")
 
-        first_listen_year = df.groupby('artist_name')['year'].min()
+        first_listen_year = first_artist_year(df)
         new_artists_in_range = ((first_listen_year >= start_year) & (first_listen_year <= end_year)).sum()
 
         # Only show "new discovered" if it's different from total (i.e., not the full dataset range)
@@ -316,8 +527,7 @@ else:
     with col4:
         st.metric("Unique Tracks", f"{tracks:,}")
 
-        df['track_key'] = df['track_name'] + ' - ' + df['artist_name']
-        first_listen_year = df.groupby('track_key')['year'].min()
+        first_listen_year = first_track_year(df)
         new_tracks_in_range = ((first_listen_year >= start_year) & (first_listen_year <= end_year)).sum()
 
         # Only show "new discovered" if it's different from total (i.e., not the full dataset range)
@@ -342,83 +552,39 @@ if start_year == end_year:
 else:
     st.caption(f"{start_year} - {end_year}")
 
-top_artists = filtered_df['artist_name'].value_counts().head(10)
+# Plays per artist/track, shared with the seasonal top 30 below; nlargest only
+# partially sorts the counts
+artist_counts = filtered_df.groupby('artist_name', observed=True, sort=False).size()
+track_counts = filtered_df.groupby('track_name', observed=True, sort=False).size()
+
+top_artists = artist_counts.nlargest(10)
+artist_imgs = dict(zip(top_artists.index, fetch_images(get_artist_image, top_artists.index)))
 
 col1, col2 = st.columns([1, 1])
 
 # Left column: Horizontal bar chart
 with col1:
-    fig = px.bar(
-        x=top_artists.values,
-        y=top_artists.index,
+    fig = go.Figure(go.Bar(
+        x=top_artists.to_numpy(),
+        y=top_artists.index.to_numpy(),
         orientation='h',
-        labels={'x': 'Plays', 'y': ''},
-        title=''
-    )
-    fig.update_traces(
         marker_color='#1DB954',
         hovertemplate='<b>%{y}</b><br>%{x:,} plays<extra></extra>'
-    )
+    ))
     fig.update_layout(
+        xaxis_title='Plays',
         yaxis={'categoryorder':'total ascending'},
-        height=450
+        height=450,
+        margin=dict(t=60)  # Plotly Express' top margin, keeps the list beside it aligned
     )
     st.plotly_chart(fig, use_container_width=True)
 
-# Right column: Artist list with images in two sub-columns
+# Right column: Artist list with images in two columns
 with col2:
-    # Add top padding to align with chart title area
-    st.markdown('<div style="margin-top: 55px;"></div>', unsafe_allow_html=True)
-
-    subcol1, subcol2 = st.columns(2)
-
-    # Artists 1-5
-    with subcol1:
-        for i in range(5):
-            if i < len(top_artists):
-                artist = top_artists.index[i]
-                plays = top_artists.values[i]
-                artist_img = get_artist_image(artist)
-
-                # Use HTML to create inline image + text layout
-                if artist_img:
-                    img_html = f'<img src="{artist_img}" width="50" style="border-radius: 4px; vertical-align: middle; margin-right: 10px;">'
-                else:
-                    img_html = f'<span style="display: inline-block; width: 50px; height: 50px; background: #282828; border-radius: 4px; text-align: center; line-height: 50px; margin-right: 10px; vertical-align: middle;">🎤</span>'
-
-                st.markdown(f"""
-                    <div style="display: flex; align-items: center; margin-bottom: 15px;">
-                        {img_html}
-                        <div>
-                            <b>{i+1}.</b> {artist}<br>
-                            <span style="color: #B3B3B3; font-size: 0.85rem;">{plays:,} plays</span>
-                        </div>
-                    </div>
-                """, unsafe_allow_html=True)
-
-    # Artists 6-10
-    with subcol2:
-        for i in range(5, 10):
-            if i < len(top_artists):
-                artist = top_artists.index[i]
-                plays = top_artists.values[i]
-                artist_img = get_artist_image(artist)
-
-                # Use HTML to create inline image + text layout
-                if artist_img:
-                    img_html = f'<img src="{artist_img}" width="50" style="border-radius: 4px; vertical-align: middle; margin-right: 10px;">'
-                else:
-                    img_html = f'<span style="display: inline-block; width: 50px; height: 50px; background: #282828; border-radius: 4px; text-align: center; line-height: 50px; margin-right: 10px; vertical-align: middle;">🎤</span>'
-
-                st.markdown(f"""
-                    <div style="display: flex; align-items: center; margin-bottom: 15px;">
-                        {img_html}
-                        <div>
-                            <b>{i+1}.</b> {artist}<br>
-                            <span style="color: #B3B3B3; font-size: 0.85rem;">{plays:,} plays</span>
-                        </div>
-                    </div>
-                """, unsafe_allow_html=True)
+    st.markdown(top_ten_html(
+        [(artist_imgs[artist], artist, f"{plays:,} plays") for artist, plays in top_artists.items()],
+        '🎤'
+    ), unsafe_allow_html=True)
 
 st.markdown("---")
 
@@ -429,7 +595,15 @@ if start_year == end_year:
 else:
     st.caption(f"{start_year} - {end_year}")
 
-top_songs = filtered_df['track_name'].value_counts().head(10)
+# The top 10 songs are the head of the top 30 shown in the seasonal section,
+# so one artist lookup over the top 30 serves both
+top_30_songs = track_counts.nlargest(30)
+top_songs = top_30_songs.head(10)
+top_song_artist = song_artists_for(filtered_df, top_30_songs.index)
+song_imgs = dict(zip(
+    top_songs.index,
+    fetch_images(get_track_image, top_songs.index, [top_song_artist[song] for song in top_songs.index])
+))
 
 col1, col2 = st.columns([1, 1])
 
@@ -440,83 +614,32 @@ with col1:
     song_names = []
     artists = []
     for song in top_songs.index:
-        artist = filtered_df[filtered_df['track_name'] == song]['artist_name'].iloc[0]
+        artist = top_song_artist[song]
         song_labels.append(f"<b>{song}</b><br>{artist}")
         song_names.append(song)
         artists.append(artist)
 
-    fig = px.bar(
-        x=top_songs.values,
+    fig = go.Figure(go.Bar(
+        x=top_songs.to_numpy(),
         y=song_labels,
         orientation='h',
-        labels={'x': 'Plays', 'y': ''},
-        title=''
-    )
-    fig.update_traces(
         marker_color='#1DB954',
         customdata=list(zip(song_names, artists, top_songs.values)),
         hovertemplate='<b>%{customdata[0]}</b><br>%{customdata[1]}<br>%{customdata[2]:,} plays<extra></extra>'
-    )
+    ))
     fig.update_layout(
+        xaxis_title='Plays',
         yaxis={'categoryorder':'total ascending'},
-        height=450
+        height=450,
+        margin=dict(t=60)  # Plotly Express' top margin, keeps the list beside it aligned
     )
     st.plotly_chart(fig, use_container_width=True)
 
 with col2:
-    st.markdown('<div style="margin-top: 55px;"></div>', unsafe_allow_html=True)
-
-    subcol1, subcol2 = st.columns(2)
-
-    # Songs 1-5
-    with subcol1:
-        for i in range(5):
-            if i < len(top_songs):
-                song = top_songs.index[i]
-                artist = filtered_df[filtered_df['track_name'] == song]['artist_name'].iloc[0]
-                plays = top_songs.values[i]
-                album_img = get_track_image(song, artist)
-
-                # Use HTML to create inline image + text layout
-                if album_img:
-                    img_html = f'<img src="{album_img}" width="50" style="border-radius: 4px; vertical-align: middle; margin-right: 10px;">'
-                else:
-                    img_html = f'<span style="display: inline-block; width: 50px; height: 50px; background: #282828; border-radius: 4px; text-align: center; line-height: 50px; margin-right: 10px; vertical-align: middle;">🎵</span>'
-
-                st.markdown(f"""
-                    <div style="display: flex; align-items: center; margin-bottom: 15px;">
-                        {img_html}
-                        <div>
-                            <b>{i+1}.</b> {song}<br>
-                            <span style="color: #B3B3B3; font-size: 0.85rem;">{artist} - {plays:,} plays</span>
-                        </div>
-                    </div>
-                """, unsafe_allow_html=True)
-
-    # Songs 6-10
-    with subcol2:
-        for i in range(5, 10):
-            if i < len(top_songs):
-                song = top_songs.index[i]
-                artist = filtered_df[filtered_df['track_name'] == song]['artist_name'].iloc[0]
-                plays = top_songs.values[i]
-                album_img = get_track_image(song, artist)
-
-                # Use HTML to create inline image + text layout
-                if album_img:
-                    img_html = f'<img src="{album_img}" width="50" style="border-radius: 4px; vertical-align: middle; margin-right: 10px;">'
-                else:
-                    img_html = f'<span style="display: inline-block; width: 50px; height: 50px; background: #282828; border-radius: 4px; text-align: center; line-height: 50px; margin-right: 10px; vertical-align: middle;">🎵</span>'
-
-                st.markdown(f"""
-                    <div style="display: flex; align-items: center; margin-bottom: 15px;">
-                        {img_html}
-                        <div>
-                            <b>{i+1}.</b> {song}<br>
-                            <span style="color: #B3B3B3; font-size: 0.85rem;">{artist} - {plays:,} plays</span>
-                        </div>
-                    </div>
-                """, unsafe_allow_html=True)
+    st.markdown(top_ten_html(
+        [(song_imgs[song], song, f"{top_song_artist[song]} - {plays:,} plays") for song, plays in top_songs.items()],
+        '🎵'
+    ), unsafe_allow_html=True)
 
 st.markdown("---")
 
@@ -530,89 +653,89 @@ else:
 # Allow user to toggle between different time granularities
 view = st.radio("View by:", ["Month", "Week", "Day"], horizontal=True)
 
-# Aggregate plays based on selected time period
-if view == "Month":
-    # Group by month and convert period index to timestamps for plotting
-    time_data = filtered_df.groupby(filtered_df['played_at_local'].dt.to_period('M')).size()
-    time_data.index = time_data.index.to_timestamp()
-    hover_template = '<b>%{x|%B %Y}</b><br>%{y:,} plays<extra></extra>'
-elif view == "Week":
-    # Group by week (Sunday to Saturday)
-    time_data = filtered_df.groupby(filtered_df['played_at_local'].dt.to_period('W')).size()
-    time_data.index = time_data.index.to_timestamp()
-    hover_template = '<b>Week of %{x|%b %d, %Y}</b><br>%{y:,} plays<extra></extra>'
-else:
-    # Daily granularity for detailed analysis
-    time_data = filtered_df.groupby(filtered_df['date']).size()
-    hover_template = '<b>%{x|%B %d, %Y}</b><br>%{y:,} plays<extra></extra>'
-
-fig = px.line(
-    x=time_data.index,
-    y=time_data.values,
-    labels={'x': '', 'y': 'Plays'},
-    title=f'Plays per {view}'
-)
-fig.update_traces(
-    line_color='#1DB954',
-    hovertemplate=hover_template
-)
+@st.cache_data(show_spinner=False)
+def build_activity_fig(df, view, start_year, end_year):
+    """Line chart of plays per month/week/day over the selected years."""
+    filtered_df = select_years(df, start_year, end_year)
+
+    # Aggregate plays based on selected time period; weeks run Monday to Sunday
+    # and are labelled by their Monday (left-closed/left-labelled is already the
+    # default for the month and day rules)
+    rule, hover_template = {
+        "Month": ('MS', '<b>%{x|%B %Y}</b><br>%{y:,} plays<extra></extra>'),
+        "Week": ('W-MON', '<b>Week of %{x|%b %d, %Y}</b><br>%{y:,} plays<extra></extra>'),
+        "Day": ('D', '<b>%{x|%B %d, %Y}</b><br>%{y:,} plays<extra></extra>'),
+    }[view]
+    time_data = filtered_df.resample(rule, on='played_at_local', label='left', closed='left').size()
+    # Plot local wall-clock dates
+    time_data.index = time_data.index.tz_localize(None)
+
+    fig = px.line(
+        x=time_data.index.to_numpy(),
+        y=time_data.to_numpy(),
+        labels={'x': '', 'y': 'Plays'},
+        title=f'Plays per {view}'
+    )
+    fig.update_traces(
+        line_color='#1DB954',
+        hovertemplate=hover_template
+    )
 
-if len(time_data) > 0:
-    first_date = time_data.index[0]
-    last_date = time_data.index[-1]
-    first_year = first_date.year
-    last_year = last_date.year
+    if len(time_data) > 0:
+        first_date = time_data.index[0]
+        last_date = time_data.index[-1]
+        first_year = first_date.year
+        last_year = last_date.year
 
-    if hasattr(time_data.index, 'year'):
         years_in_data = sorted(set(time_data.index.year))
-    else:
-        years_in_data = sorted(set([pd.Timestamp(d).year for d in time_data.index]))
 
-    y_max = max(time_data.values)
+        y_max = max(time_data.values)
+
+        for year in years_in_data:
+            if year > first_year:
+                jan_first = pd.Timestamp(f'{year}-01-01')
+                fig.add_shape(
+                    type="line",
+                    x0=jan_first, x1=jan_first,
+                    y0=y_max * 0.05, y1=y_max,
+                    line=dict(color="lightgray", width=1.5, dash="dot"),
+                    opacity=0.5
+                )
+                fig.add_annotation(
+                    x=jan_first,
+                    y=0,
+                    text=str(year),
+                    showarrow=False,
+                    yshift=-30,
+                    xshift=0,
+                    font=dict(size=10, color="gray")
+                )
 
-    for year in years_in_data:
-        if year > first_year:
-            jan_first = pd.Timestamp(f'{year}-01-01')
-            fig.add_shape(
-                type="line",
-                x0=jan_first, x1=jan_first,
-                y0=y_max * 0.05, y1=y_max,
-                line=dict(color="lightgray", width=1.5, dash="dot"),
-                opacity=0.5
-            )
+        fig.add_annotation(
+            x=first_date,
+            y=0,
+            text=str(first_year),
+            showarrow=False,
+            yshift=-30,
+            xshift=20,
+            font=dict(size=10, color="gray")
+        )
+
+        if last_year == datetime.now().year:
             fig.add_annotation(
-                x=jan_first,
+                x=last_date,
                 y=0,
-                text=str(year),
+                text="current day",
                 showarrow=False,
                 yshift=-30,
-                xshift=0,
+                xshift=-20,
                 font=dict(size=10, color="gray")
             )
 
-    fig.add_annotation(
-        x=first_date,
-        y=0,
-        text=str(first_year),
-        showarrow=False,
-        yshift=-30,
-        xshift=20,
-        font=dict(size=10, color="gray")
-    )
+    fig.update_xaxes(showticklabels=False, title_text='')
+    return fig
 
-    if last_year == datetime.now().year:
-        fig.add_annotation(
-            x=last_date,
-            y=0,
-            text="current day",
-            showarrow=False,
-            yshift=-30,
-            xshift=-20,
-            font=dict(size=10, color="gray")
-        )
-
-fig.update_xaxes(showticklabels=False, title_text='')
-st.plotly_chart(fig, use_container_width=True)
+st.plotly_chart(build_activity_fig(df, view, start_year, end_year), use_container_width=True)
 
 st.markdown("---")
 
@@ -622,10 +745,11 @@ if start_year == end_year:
 else:
     st.caption(f"{start_year} - {end_year}")
 
-col1, col2 = st.columns(2)
-
-with col1:
-    hour_counts = filtered_df.groupby('hour').size().reindex(range(24), fill_value=0)
+@st.cache_data(show_spinner=False)
+def build_hour_fig(df, start_year, end_year):
+    """Polar bar chart of plays per hour of the day over the selected years."""
+    filtered_df = select_years(df, start_year, end_year)
+    hour_counts = np.bincount(filtered_df['hour'].to_numpy(), minlength=24)
 
     hour_labels = []
     for h in range(24):
@@ -639,7 +763,7 @@ with col1:
             hour_labels.append(f'{h-12}pm')
 
     fig = px.bar_polar(
-        r=hour_counts.values,
+        r=hour_counts,
         theta=hour_labels,
         title='Plays by Hour'
     )
@@ -668,25 +792,25 @@ with col1:
         height=500,
         font=dict(color='#FFFFFF')
     )
-    st.plotly_chart(fig, use_container_width=True)
-
-with col2:
-    day_counts = filtered_df.groupby('day_of_week').size()
-
-    all_dates = pd.date_range(
-        start=filtered_df['played_at_local'].min().date(),
-        end=filtered_df['played_at_local'].max().date(),
-        freq='D'
+    return fig
+
+@st.cache_data(show_spinner=False)
+def build_weekday_fig(df, start_year, end_year):
+    """Line chart of average plays per day of the week over the selected years."""
+    filtered_df = select_years(df, start_year, end_year)
+    day_counts = np.bincount(filtered_df['day_of_week'].to_numpy(), minlength=7)
+
+    # Rows are in time order, so the first and last rows span the range
+    day_occurrences = weekday_counts(
+        filtered_df['played_at_local'].iloc[0].date(),
+        filtered_df['played_at_local'].iloc[-1].date()
     )
-    day_occurrences = all_dates.dayofweek.value_counts().sort_index()
-    avg_plays_per_day = day_counts / day_occurrences
-
-    day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    day_labels = [day_order[i] for i in sorted(avg_plays_per_day.index)]
+    # Weekdays that never occur in a range shorter than a week have no average
+    avg_plays_per_day = np.divide(day_counts, day_occurrences, out=np.full(7, np.nan), where=day_occurrences > 0)
 
     fig = px.line(
-        x=day_labels,
-        y=avg_plays_per_day.sort_index().values,
+        x=DAY_NAMES,
+        y=avg_plays_per_day,
         labels={'x': 'Day of Week', 'y': 'Avg Plays per Day'},
         title='Average Plays per Day of Week',
         markers=True
@@ -696,57 +820,57 @@ with col2:
         marker=dict(size=8),
         hovertemplate='<b>%{x}</b><br>Average: %{y:.1f} plays/day<extra></extra>'
     )
-    st.plotly_chart(fig, use_container_width=True)
+    return fig
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.plotly_chart(build_hour_fig(df, start_year, end_year), use_container_width=True)
+
+with col2:
+    st.plotly_chart(build_weekday_fig(df, start_year, end_year), use_container_width=True)
 
 st.markdown("---")
 
 # Artist discovery (all-time only)
 st.subheader("Artist Discovery (All-Time)")
 
-col1, col2 = st.columns(2)
-
-with col1:
-    # New artists per year (using full dataset) - only count artists with 1+ plays
-    artist_year_plays = df.groupby(['artist_name', 'year']).size().reset_index(name='plays')
-    # Filter to artists with 1+ plays in their discovery year
-    artist_year_plays = artist_year_plays[artist_year_plays['plays'] >= 1]
-
+@st.cache_data(show_spinner=False)
+def build_discovery_figs(df):
+    """New artists per year and cumulative artist discovery, over the full dataset."""
     # Find first year each artist was listened to (with 1+ plays)
-    first_plays = df.groupby('artist_name')['played_at_local'].min()
+    first_plays = df.groupby('artist_name', observed=True)['played_at_local'].min()
     discoveries = first_plays.dt.year.value_counts().sort_index()
 
-    fig = px.bar(
-        x=discoveries.index,
-        y=discoveries.values,
+    bar_fig = px.bar(
+        x=discoveries.index.to_numpy(),
+        y=discoveries.to_numpy(),
         labels={'x': 'Year', 'y': 'New Artists Discovered'},
         title='New Artists Discovered by Year'
     )
-    fig.update_traces(
+    bar_fig.update_traces(
         marker_color='#1DB954',
         hovertemplate='<b>%{x}</b><br>%{y:,} new artists<extra></extra>'
     )
 
     # Show year on every bar
-    fig.update_xaxes(
+    bar_fig.update_xaxes(
         tickmode='linear',
         dtick=1,
         tickangle=0
     )
 
-    st.plotly_chart(fig, use_container_width=True)
-
-with col2:
     # Cumulative (using full dataset)
-    cumulative = range(1, len(first_plays) + 1)
-    sorted_dates = sorted(first_plays.values)
+    sorted_dates = np.sort(first_plays.values)
+    cumulative = np.arange(1, sorted_dates.size + 1)
 
-    fig = px.line(
+    cumulative_fig = px.line(
         x=sorted_dates,
         y=cumulative,
         labels={'x': 'Date', 'y': 'Total Artists'},
         title='Cumulative Artist Discovery'
     )
-    fig.update_traces(
+    cumulative_fig.update_traces(
         line_color='#1DB954',
         hovertemplate='<b>%{x|%B %d, %Y}</b><br>%{y:,} total artists<extra></extra>'
     )
@@ -762,7 +886,7 @@ with col2:
 
         for year in range(first_year + 1, last_year + 1):
             jan_first = pd.Timestamp(f'{year}-01-01')
-            fig.add_shape(
+            cumulative_fig.add_shape(
                 type="line",
                 x0=jan_first, x1=jan_first,
                 y0=y_max * 0.05, y1=y_max,
@@ -770,7 +894,17 @@ with col2:
                 opacity=0.5
             )
 
-    st.plotly_chart(fig, use_container_width=True)
+    return bar_fig, cumulative_fig
+
+discoveries_fig, cumulative_fig = build_discovery_figs(df)
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.plotly_chart(discoveries_fig, use_container_width=True)
+
+with col2:
+    st.plotly_chart(cumulative_fig, use_container_width=True)
 
 st.markdown("---")
 
@@ -787,56 +921,56 @@ st.markdown("""
     </div>
 """, unsafe_allow_html=True)
 
-# Define seasons based on meteorological seasons
-def get_season(month):
-    if month in [12, 1, 2]:
-        return 'Winter'
-    elif month in [3, 4, 5]:
-        return 'Spring'
-    elif month in [6, 7, 8]:
-        return 'Summer'
-    else:  # 9, 10, 11
-        return 'Fall'
-
-filtered_df['season'] = filtered_df['month'].apply(get_season)
-
+# Define seasons based on meteorological seasons: position in season_order,
+# indexed by month number (1-12)
 season_order = ['Winter', 'Spring', 'Summer', 'Fall']
+_SEASON_CODE_BY_MONTH = np.array([0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0])
 season_emoji = {'Winter': '❄️', 'Spring': '🌸', 'Summer': '☀️', 'Fall': '🍂'}
 season_colors = {'Winter': '#4A90E2', 'Spring': '#81C784', 'Summer': '#FFB74D', 'Fall': '#E57373'}
 
-# Overall seasonal distribution
-st.markdown("#### Your Overall Seasonal Listening")
-
-all_season_totals = filtered_df.groupby('season').size().reindex(season_order)
-
-col1, col2 = st.columns(2)
+@st.cache_data(show_spinner=False)
+def build_season_figs(df, start_year, end_year):
+    """Bar and pie charts of total plays per season over the selected years."""
+    filtered_df = select_years(df, start_year, end_year)
+    season_codes = _SEASON_CODE_BY_MONTH[filtered_df['month'].to_numpy()]
+    all_season_totals = pd.Series(np.bincount(season_codes, minlength=len(season_order)), index=season_order)
 
-with col1:
-    fig = px.bar(
+    bar_fig = px.bar(
         x=season_order,
-        y=all_season_totals.values,
+        y=all_season_totals.to_numpy(),
         labels={'x': 'Season', 'y': 'Total Plays'},
         title='Total Plays by Season'
     )
-    fig.update_traces(
+    bar_fig.update_traces(
         marker_color=[season_colors[s] for s in season_order],
         hovertemplate='<b>%{x}</b><br>%{y:,} plays<extra></extra>'
     )
-    st.plotly_chart(fig, use_container_width=True)
 
-with col2:
     # Pie chart showing percentage distribution
-    fig = px.pie(
-        values=all_season_totals.values,
+    pie_fig = px.pie(
+        values=all_season_totals.to_numpy(),
         names=season_order,
         title='Seasonal Distribution (%)',
         color=season_order,
         color_discrete_map=season_colors
     )
-    fig.update_traces(
+    pie_fig.update_traces(
         hovertemplate='<b>%{label}</b><br>%{value:,} plays<br>%{percent}<extra></extra>'
     )
-    st.plotly_chart(fig, use_container_width=True)
+    return bar_fig, pie_fig
+
+# Overall seasonal distribution
+st.markdown("#### Your Overall Seasonal Listening")
+
+season_bar_fig, season_pie_fig = build_season_figs(df, start_year, end_year)
+
+col1, col2 = st.columns(2)
+
+with col1:
+    st.plotly_chart(season_bar_fig, use_container_width=True)
+
+with col2:
+    st.plotly_chart(season_pie_fig, use_container_width=True)
 
 st.markdown("---")
 
@@ -867,229 +1001,106 @@ with sort_col:
 
 st.markdown(f"#### Top {view_type} by Season")
 
-if view_type == "Artists":
-    # Get top 30 artists overall from filtered range
-    top_30_items = filtered_df['artist_name'].value_counts().head(30).index.tolist()
-    seasonal_df = filtered_df[filtered_df['artist_name'].isin(top_30_items)]
+def season_play_counts(items_df, column, items):
+    """Plays per season for each of items, as an items x season_order array (rows in items order).
 
-    # Calculate plays per season for each artist
-    season_item_plays = seasonal_df.groupby(['artist_name', 'season']).size().reset_index(name='plays')
-
-    # Create a pivot table
-    heatmap_data = season_item_plays.pivot(index='artist_name', columns='season', values='plays').fillna(0)
-    heatmap_data = heatmap_data.reindex(columns=season_order, fill_value=0)
-
-    # Calculate percentage distribution
-    heatmap_data_pct = heatmap_data.div(heatmap_data.sum(axis=1), axis=0) * 100
+    Counts (item, season) code pairs with a single bincount rather than a
+    two-key groupby and pivot.
+    """
+    n_seasons = len(season_order)
+    item_codes = pd.Categorical(items_df[column], categories=items).codes.astype(np.int64)
+    season_codes = _SEASON_CODE_BY_MONTH[items_df['month'].to_numpy()]
+    counts = np.bincount(item_codes * n_seasons + season_codes, minlength=len(items) * n_seasons)
+    # Per-season play counts fit comfortably in int32
+    return counts.reshape(-1, n_seasons).astype(np.int32)
+
+@st.cache_data(show_spinner=False)
+def seasonal_item_stats(df, column, items, start_year, end_year):
+    """Plays per season and season percentages for items over the selected years.
+
+    Rows follow items. Doesn't depend on the season filter or sort option, so
+    toggling those reuses it.
+    """
+    # Only the item and month columns are needed; project before masking
+    proj = select_years(df, start_year, end_year)[[column, 'month']]
+    seasonal_df = proj[proj[column].isin(items)]
 
-    # Calculate total plays per item for sorting
-    total_plays_per_item = heatmap_data.sum(axis=1)
+    # Calculate plays per season for each item
+    hm_arr = season_play_counts(seasonal_df, column, items)
 
-    # Sort based on selected season and sort option
-    if selected_season == "All Seasons":
-        item_order = total_plays_per_item.sort_values(ascending=False).index.tolist()
-    else:
-        if sort_by == "Total Plays":
-            item_order = total_plays_per_item.sort_values(ascending=False).index.tolist()
-        elif sort_by == "Season Plays":
-            item_order = heatmap_data[selected_season].sort_values(ascending=False).index.tolist()
-        else:  # Season %
-            item_order = heatmap_data_pct[selected_season].sort_values(ascending=False).index.tolist()
-
-    # Split into two columns of 15 items each (with gap adjustment)
-    left_col, right_col = st.columns([1, 1], gap="medium")
-
-    # Left column: Items 1-15
-    with left_col:
-        for idx in range(15):
-            if idx < len(item_order):
-                item = item_order[idx]
-                global_rank = idx + 1
-                total_item_plays = int(total_plays_per_item[item])
-
-                # Get artist image
-                item_img = get_artist_image(item)
-
-                # Season boxes with hover (outline style)
-                season_boxes = " ".join([
-                    f"<span title='{int(heatmap_data.loc[item, season]):,} plays' style='display: inline-block; border: 1.5px solid {season_colors[season]}; color: {season_colors[season]}; opacity: {1.0 if (selected_season == 'All Seasons' or selected_season == season) else 0.35}; padding: 2px 6px; border-radius: 4px; margin-right: 4px; font-size: 0.7rem; cursor: help;'>{season_emoji[season]} {heatmap_data_pct.loc[item, season]:.0f}%</span>"
-                    for season in season_order
-                ])
-
-                # Use HTML to create inline image + text layout (matching Top 10 style)
-                if item_img:
-                    img_html = f'<img src="{item_img}" width="55" height="55" style="border-radius: 4px; margin-right: 10px; object-fit: cover; flex-shrink: 0;">'
-                else:
-                    img_html = f'<span style="display: inline-block; width: 55px; height: 55px; background: #282828; border-radius: 4px; text-align: center; line-height: 55px; margin-right: 10px; flex-shrink: 0; font-size: 1.3rem;">🎤</span>'
-
-                st.markdown(f"""
-                    <div style="display: flex; align-items: center; margin-bottom: 12px; padding: 8px; border-radius: 6px; transition: background-color 0.2s;">
-                        {img_html}
-                        <div style="flex: 1; min-width: 0;">
-                            <div style="margin-bottom: 3px; overflow: hidden; text-overflow: ellipsis;">
-                                <span style='font-size: 0.85rem; font-weight: 600; color: #1DB954;'>#{global_rank}</span>
-                                <span style="font-weight: 600; margin-left: 4px;">{item}</span>
-                                <span style='color: #B3B3B3; font-size: 0.8rem; margin-left: 6px;'>({total_item_plays:,})</span>
-                            </div>
-                            <div style="margin-top: 4px;">{season_boxes}</div>
-                        </div>
-                    </div>
-                """, unsafe_allow_html=True)
-
-    # Right column: Items 16-30
-    with right_col:
-        for idx in range(15, 30):
-            if idx < len(item_order):
-                item = item_order[idx]
-                global_rank = idx + 1
-                total_item_plays = int(total_plays_per_item[item])
-
-                # Get artist image
-                item_img = get_artist_image(item)
-
-                # Season boxes with hover (outline style)
-                season_boxes = " ".join([
-                    f"<span title='{int(heatmap_data.loc[item, season]):,} plays' style='display: inline-block; border: 1.5px solid {season_colors[season]}; color: {season_colors[season]}; opacity: {1.0 if (selected_season == 'All Seasons' or selected_season == season) else 0.35}; padding: 2px 6px; border-radius: 4px; margin-right: 4px; font-size: 0.7rem; cursor: help;'>{season_emoji[season]} {heatmap_data_pct.loc[item, season]:.0f}%</span>"
-                    for season in season_order
-                ])
-
-                # Use HTML to create inline image + text layout (matching Top 10 style)
-                if item_img:
-                    img_html = f'<img src="{item_img}" width="55" height="55" style="border-radius: 4px; margin-right: 10px; object-fit: cover; flex-shrink: 0;">'
-                else:
-                    img_html = f'<span style="display: inline-block; width: 55px; height: 55px; background: #282828; border-radius: 4px; text-align: center; line-height: 55px; margin-right: 10px; flex-shrink: 0; font-size: 1.3rem;">🎤</span>'
-
-                st.markdown(f"""
-                    <div style="display: flex; align-items: center; margin-bottom: 12px; padding: 8px; border-radius: 6px; transition: background-color 0.2s;">
-                        {img_html}
-                        <div style="flex: 1; min-width: 0;">
-                            <div style="margin-bottom: 3px; overflow: hidden; text-overflow: ellipsis;">
-                                <span style='font-size: 0.85rem; font-weight: 600; color: #1DB954;'>#{global_rank}</span>
-                                <span style="font-weight: 600; margin-left: 4px;">{item}</span>
-                                <span style='color: #B3B3B3; font-size: 0.8rem; margin-left: 6px;'>({total_item_plays:,})</span>
-                            </div>
-                            <div style="margin-top: 4px;">{season_boxes}</div>
-                        </div>
-                    </div>
-                """, unsafe_allow_html=True)
+    # Calculate percentage distribution; kept in float64 and divided before
+    # scaling, so the rounded labels match the pandas div(...) * 100 they replace
+    pct_arr = hm_arr / hm_arr.sum(axis=1, keepdims=True) * 100
 
-else:  # Songs
-    # Get top 30 songs overall from filtered range
-    top_30_items = filtered_df['track_name'].value_counts().head(30).index.tolist()
-    seasonal_df = filtered_df[filtered_df['track_name'].isin(top_30_items)]
+    return hm_arr, pct_arr
 
-    # Calculate plays per season for each song
-    season_item_plays = seasonal_df.groupby(['track_name', 'season']).size().reset_index(name='plays')
+# Get top 30 artists or songs overall from filtered range
+if view_type == "Artists":
+    item_column, top_30_counts = 'artist_name', artist_counts.nlargest(30)
+else:
+    item_column, top_30_counts = 'track_name', top_30_songs
+top_30_items = top_30_counts.index.tolist()
+hm_arr, pct_arr = seasonal_item_stats(
+    df, item_column, top_30_items, start_year, end_year
+)
 
-    # Create a pivot table
-    heatmap_data = season_item_plays.pivot(index='track_name', columns='season', values='plays').fillna(0)
-    heatmap_data = heatmap_data.reindex(columns=season_order, fill_value=0)
+# Sort based on selected season and sort option (ties keep the overall top 30 order)
+if selected_season == "All Seasons" or sort_by == "Total Plays":
+    sort_key = top_30_counts.to_numpy()
+else:
+    season_pos = season_order.index(selected_season)
+    if sort_by == "Season Plays":
+        sort_key = hm_arr[:, season_pos]
+    else:  # Season %
+        sort_key = pct_arr[:, season_pos]
+order = np.argsort(-sort_key, kind='stable')
+item_order = [top_30_items[i] for i in order]
+
+# Season plays and percentages in display order, indexed [rank, season position]
+hm = hm_arr[order]
+hm_pct = pct_arr[order]
+
+# Season box styling by position in season_order; the selected season's
+# boxes stay fully opaque and the others are dimmed
+season_style = tuple(
+    (season_colors[season], season_emoji[season],
+     1.0 if (selected_season == 'All Seasons' or selected_season == season) else 0.35)
+    for season in season_order
+)
 
-    # Calculate percentage distribution
-    heatmap_data_pct = heatmap_data.div(heatmap_data.sum(axis=1), axis=0) * 100
+def build_boxes(hm_row, hm_pct_row):
+    """Season boxes with hover (outline style) for one item's row of hm/hm_pct."""
+    return " ".join([
+        f"<span title='{plays:,} plays' style='display: inline-block; border: 1.5px solid {color}; color: {color}; opacity: {opacity}; padding: 2px 6px; border-radius: 4px; margin-right: 4px; font-size: 0.7rem; cursor: help;'>{emoji} {pct:.0f}%</span>"
+        for plays, pct, (color, emoji, opacity) in zip(hm_row, hm_pct_row, season_style)
+    ])
 
-    # Calculate total plays per item for sorting
-    total_plays_per_item = heatmap_data.sum(axis=1)
+season_boxes_html = [build_boxes(hm[i], hm_pct[i]) for i in range(len(item_order))]
 
-    # Sort based on selected season and sort option
-    if selected_season == "All Seasons":
-        item_order = total_plays_per_item.sort_values(ascending=False).index.tolist()
-    else:
-        if sort_by == "Total Plays":
-            item_order = total_plays_per_item.sort_values(ascending=False).index.tolist()
-        elif sort_by == "Season Plays":
-            item_order = heatmap_data[selected_season].sort_values(ascending=False).index.tolist()
-        else:  # Season %
-            item_order = heatmap_data_pct[selected_season].sort_values(ascending=False).index.tolist()
-
-    # Split into two columns of 15 items each (with gap adjustment)
-    left_col, right_col = st.columns([1, 1], gap="medium")
-
-    # Left column: Items 1-15
-    with left_col:
-        for idx in range(15):
-            if idx < len(item_order):
-                item = item_order[idx]
-                global_rank = idx + 1
-                total_item_plays = int(total_plays_per_item[item])
-
-                # Get artist for this track
-                artist = filtered_df[filtered_df['track_name'] == item]['artist_name'].iloc[0]
-
-                # Get track image
-                item_img = get_track_image(item, artist)
-
-                # Season boxes with hover (outline style)
-                season_boxes = " ".join([
-                    f"<span title='{int(heatmap_data.loc[item, season]):,} plays' style='display: inline-block; border: 1.5px solid {season_colors[season]}; color: {season_colors[season]}; opacity: {1.0 if (selected_season == 'All Seasons' or selected_season == season) else 0.35}; padding: 2px 6px; border-radius: 4px; margin-right: 4px; font-size: 0.7rem; cursor: help;'>{season_emoji[season]} {heatmap_data_pct.loc[item, season]:.0f}%</span>"
-                    for season in season_order
-                ])
-
-                # Use HTML to create inline image + text layout (matching Top 10 style)
-                if item_img:
-                    img_html = f'<img src="{item_img}" width="55" height="55" style="border-radius: 4px; margin-right: 10px; object-fit: cover; flex-shrink: 0;">'
-                else:
-                    img_html = f'<span style="display: inline-block; width: 55px; height: 55px; background: #282828; border-radius: 4px; text-align: center; line-height: 55px; margin-right: 10px; flex-shrink: 0; font-size: 1.3rem;">🎵</span>'
-
-                st.markdown(f"""
-                    <div style="display: flex; align-items: center; margin-bottom: 12px; padding: 8px; border-radius: 6px; transition: background-color 0.2s;">
-                        {img_html}
-                        <div style="flex: 1; min-width: 0;">
-                            <div style="margin-bottom: 2px; overflow: hidden; text-overflow: ellipsis;">
-                                <span style='font-size: 0.85rem; font-weight: 600; color: #1DB954;'>#{global_rank}</span>
-                                <span style="font-weight: 600; margin-left: 4px;">{item}</span>
-                                <span style='color: #B3B3B3; font-size: 0.8rem; margin-left: 6px;'>({total_item_plays:,})</span>
-                            </div>
-                            <div style='color: #B3B3B3; font-size: 0.8rem; margin-bottom: 3px;'>{artist}</div>
-                            <div style="margin-top: 3px;">{season_boxes}</div>
-                        </div>
-                    </div>
-                """, unsafe_allow_html=True)
-
-    # Right column: Items 16-30
-    with right_col:
-        for idx in range(15, 30):
-            if idx < len(item_order):
-                item = item_order[idx]
-                global_rank = idx + 1
-                total_item_plays = int(total_plays_per_item[item])
-
-                # Get artist for this track
-                artist = filtered_df[filtered_df['track_name'] == item]['artist_name'].iloc[0]
-
-                # Get track image
-                item_img = get_track_image(item, artist)
-
-                # Season boxes with hover (outline style)
-                season_boxes = " ".join([
-                    f"<span title='{int(heatmap_data.loc[item, season]):,} plays' style='display: inline-block; border: 1.5px solid {season_colors[season]}; color: {season_colors[season]}; opacity: {1.0 if (selected_season == 'All Seasons' or selected_season == season) else 0.35}; padding: 2px 6px; border-radius: 4px; margin-right: 4px; font-size: 0.7rem; cursor: help;'>{season_emoji[season]} {heatmap_data_pct.loc[item, season]:.0f}%</span>"
-                    for season in season_order
-                ])
-
-                # Use HTML to create inline image + text layout (matching Top 10 style)
-                if item_img:
-                    img_html = f'<img src="{item_img}" width="55" height="55" style="border-radius: 4px; margin-right: 10px; object-fit: cover; flex-shrink: 0;">'
-                else:
-                    img_html = f'<span style="display: inline-block; width: 55px; height: 55px; background: #282828; border-radius: 4px; text-align: center; line-height: 55px; margin-right: 10px; flex-shrink: 0; font-size: 1.3rem;">🎵</span>'
-
-                st.markdown(f"""
-                    <div style="display: flex; align-items: center; margin-bottom: 12px; padding: 8px; border-radius: 6px; transition: background-color 0.2s;">
-                        {img_html}
-                        <div style="flex: 1; min-width: 0;">
-                            <div style="margin-bottom: 2px; overflow: hidden; text-overflow: ellipsis;">
-                                <span style='font-size: 0.85rem; font-weight: 600; color: #1DB954;'>#{global_rank}</span>
-                                <span style="font-weight: 600; margin-left: 4px;">{item}</span>
-                                <span style='color: #B3B3B3; font-size: 0.8rem; margin-left: 6px;'>({total_item_plays:,})</span>
-                            </div>
-                            <div style='color: #B3B3B3; font-size: 0.8rem; margin-bottom: 3px;'>{artist}</div>
-                            <div style="margin-top: 3px;">{season_boxes}</div>
-                        </div>
-                    </div>
-                """, unsafe_allow_html=True)
-
-# Show total count
-st.caption(f"Showing top {len(item_order)} {view_type.lower()}")
-
-# Footer
-st.markdown("---")
-st.caption("Data from Spotify API + Historical Export | Updated daily via Airflow")
+if view_type == "Artists":
+    item_imgs = fetch_images(get_artist_image, item_order)
+    subtitles = [None] * len(item_order)
+    placeholder_emoji = '🎤'
+else:  # Songs
+    subtitles = [top_song_artist[item] for item in item_order]
+    item_imgs = fetch_images(get_track_image, item_order, subtitles)
+    placeholder_emoji = '🎵'
+
+parts = [
+    seasonal_row_html(idx + 1, item, int(hm[idx].sum()), season_boxes_html[idx],
+                      item_imgs[idx], placeholder_emoji, subtitles[idx])
+    for idx, item in enumerate(item_order)
+]
+
+# Two columns of 15 items each, followed by the item count and page footer
+# in the same markdown element. The captions inline the page's .stCaption rule
+# (the first one also gets the 1rem gap Streamlit puts between elements), and the
+# <hr> picks up the same global hr rule as st.markdown("---")
+caption_style = 'color: #FFFFFF; font-size: 0.9rem; letter-spacing: 2px; margin-bottom: 1.5rem;'
+st.markdown(
+    two_column_html(parts[:15], parts[15:], gap='2rem')
+    + f'<div style="{caption_style} margin-top: 1rem;">Showing top {len(item_order)} {view_type.lower()}</div>'
+    '<hr>'
+    f'<div style="{caption_style} margin-top: 0rem;">Data from Spotify API + Historical Export | Updated daily via Airflow</div>',
+    unsafe_allow_html=True
+)